@@ -0,0 +1,60 @@
+"""
+Scaling benchmark for the thread-pool batch engine.
+
+Run with both a regular and a free-threaded (3.13t) interpreter to compare:
+
+    python -m benchmarks.batch_scaling --docs 32
+
+Only GIL builds have been measured so far (CPython 3.9, 16 docs): get scaled
+about 2-3x with 2-4 workers, apply did not scale. The SHA-512 spin loop in
+apply hashes 64-byte buffers, and hashlib does not release the GIL for them,
+so apply is only expected to scale on a free-threaded build. No-GIL numbers
+are still missing.
+"""
+import argparse
+import shutil
+import sys
+import sysconfig
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from docx_locker import apply_docx_protection_batch, get_docx_protection_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=32, help='Number of documents per run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to compare')
+    parser.add_argument('--source', default='tests/test_files/unprotected.docx', help='Document to copy')
+    args = parser.parse_args()
+
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f'Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, GIL enabled: {gil_enabled}')
+    print(f'{"workers":>8} {"apply (s)":>10} {"speedup":>8} {"get (s)":>10} {"speedup":>8}')
+
+    baseline = None
+    for workers in args.workers:
+        with TemporaryDirectory() as tmp_dir:
+            doc_paths = []
+            for i in range(args.docs):
+                doc_path = Path(tmp_dir) / f'doc_{i}.docx'
+                shutil.copyfile(args.source, doc_path)
+                doc_paths.append(str(doc_path))
+
+            start = time.perf_counter()
+            apply_docx_protection_batch(doc_paths, 'password', max_workers=workers)
+            apply_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            get_docx_protection_batch(doc_paths, max_workers=workers)
+            get_time = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = (apply_time, get_time)
+        print(f'{workers:>8} {apply_time:>10.3f} {baseline[0] / apply_time:>8.2f} '
+              f'{get_time:>10.3f} {baseline[1] / get_time:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,23 @@
-from .docx_locker import apply_docx_protection, get_docx_protection, DocxProtectionParams
+from .docx_locker import (
+    apply_docx_protection,
+    get_docx_protection,
+    DocxProtectionParams,
+    protection_params_to_tuples,
+    protection_params_from_tuples,
+)
+from .container import apply_container_protection, get_container_protection
+from .batch import apply_docx_protection_batch, get_docx_protection_batch
 
-__all__ = ["apply_docx_protection", "get_docx_protection", "DocxProtectionParams"]
+__all__ = [
+    "apply_docx_protection",
+    "get_docx_protection",
+    "DocxProtectionParams",
+    "protection_params_to_tuples",
+    "protection_params_from_tuples",
+    "apply_container_protection",
+    "get_container_protection",
+    "apply_docx_protection_batch",
+    "get_docx_protection_batch",
+]
 
 __version__ = "0.7.1"
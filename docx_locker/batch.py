@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Literal, Optional, Union
+from .docx_locker import DocxProtectionParams, apply_docx_protection, get_docx_protection
+
+
+def _run_batch(
+    func: Callable[[str], Optional[DocxProtectionParams]],
+    doc_paths: List[str],
+    max_workers: Optional[int],
+    return_exceptions: bool
+) -> Dict[str, Union[Optional[DocxProtectionParams], Exception]]:
+    # Every document is submitted and waited on, a failure never cancels the rest
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {doc_path: executor.submit(func, doc_path) for doc_path in doc_paths}
+        wait(futures.values())
+
+    results = {}
+    for doc_path, future in futures.items():
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            # Raise the first failure in input order
+            raise error
+        results[doc_path] = error if error is not None else future.result()
+    return results
+
+
+def get_docx_protection_batch(
+    doc_paths: Iterable[str],
+    max_workers: int = None,
+    return_exceptions: bool = False
+) -> Dict[str, Union[Optional[DocxProtectionParams], Exception]]:
+    # Duplicate paths are only read once
+    doc_paths = list(dict.fromkeys(doc_paths))
+
+    return _run_batch(get_docx_protection, doc_paths, max_workers, return_exceptions)
+
+
+def apply_docx_protection_batch(
+    doc_paths: Iterable[str],
+    password: str,
+    salt: str = None,
+    edit_option: Literal["forms", "none", "readOnly", "trackedChanges", "comments"] = "trackedChanges",
+    enforce_option: Literal[0, 1] = 1,
+    return_protection_params: bool = False,
+    if_needed: bool = False,
+    deterministic: bool = False,
+    max_workers: int = None,
+    return_exceptions: bool = False
+) -> Optional[Dict[str, Union[DocxProtectionParams, Exception]]]:
+    # Duplicate paths would race on writing the same file
+    doc_paths = list(dict.fromkeys(doc_paths))
+
+    def protect(doc_path: str) -> Optional[DocxProtectionParams]:
+        return apply_docx_protection(
+            doc_path,
+            password,
+            salt=salt,
+            edit_option=edit_option,
+            enforce_option=enforce_option,
+            return_protection_params=True,
+            if_needed=if_needed,
+            deterministic=deterministic
+        )
+
+    results = _run_batch(protect, doc_paths, max_workers, return_exceptions)
+
+    # Failed documents are only reported through the results
+    if return_protection_params or return_exceptions:
+        return results
@@ -0,0 +1,186 @@
+import copy
+import gzip
+import os
+import tarfile
+from uuid import uuid4
+from zipfile import ZipFile, ZIP_DEFLATED
+from io import BytesIO
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Literal, Optional, Tuple, Union
+from .docx_locker import DocxProtectionParams, DETERMINISTIC_COMPRESSLEVEL, _read_docx_protection, _protect_docx
+
+
+# Local file header and empty archive signatures a zip container starts with
+ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')
+
+# Tar compression picked from the output file suffix
+TAR_WRITE_MODES = {
+    '.tar': 'w',
+    '.tar.gz': 'w:gz',
+    '.tgz': 'w:gz',
+    '.tar.bz2': 'w:bz2',
+    '.tbz2': 'w:bz2',
+    '.tar.xz': 'w:xz',
+    '.txz': 'w:xz',
+}
+
+
+def _is_docx(name: str) -> bool:
+    return name.lower().endswith('.docx')
+
+
+def _tar_write_mode(output_file: Path) -> Optional[str]:
+    name = output_file.name.lower()
+    for suffix, mode in TAR_WRITE_MODES.items():
+        if name.endswith(suffix):
+            return mode
+    return None
+
+
+@contextmanager
+def _open_tar_output(temp_file: Path, mode: str, deterministic: bool) -> Iterator[tarfile.TarFile]:
+    if deterministic and mode == 'w:gz':
+        # tarfile writes the current time and the temp file name into the gzip header, bz2 and xz store neither
+        with open(temp_file, 'wb') as raw, \
+                gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as compressed, \
+                tarfile.open(fileobj=compressed, mode='w') as output:
+            yield output
+    else:
+        with tarfile.open(temp_file, mode) as output:
+            yield output
+
+
+def _check_output_suffix(is_zip: bool, output_file: Path):
+    # The output keeps the container format, so its suffix must name that format
+    if is_zip:
+        if output_file.suffix.lower() != '.zip':
+            raise ValueError(f"The output path must end with .zip for a zip container: {output_file}")
+    elif _tar_write_mode(output_file) is None:
+        raise ValueError(
+            f"The output path must end with one of {', '.join(TAR_WRITE_MODES)} for a tar container: {output_file}")
+
+
+def _open_container(container_path: str) -> Tuple[Path, bool]:
+    # Ensure the container exists and is a supported archive
+    container_file = Path(container_path)
+    if not container_file.exists():
+        raise FileNotFoundError(f"The specified file does not exist: {container_path}")
+
+    # Detect the type from the leading magic bytes, is_zipfile also matches a plain tar ending in a docx
+    with open(container_file, 'rb') as f:
+        magic = f.read(4)
+    if magic in ZIP_MAGIC:
+        return container_file, True
+    if tarfile.is_tarfile(container_file):
+        return container_file, False
+    raise ValueError(f"The specified file is not a zip or tar archive: {container_path}")
+
+
+def get_container_protection(
+    container_path: str,
+    return_exceptions: bool = False
+) -> Dict[str, Union[Optional[DocxProtectionParams], Exception]]:
+    container_file, is_zip = _open_container(container_path)
+
+    results = {}
+
+    def read(name: str, docx_bytes: bytes):
+        try:
+            with ZipFile(BytesIO(docx_bytes), 'r') as docx:
+                results[name] = _read_docx_protection(docx)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            # Record the failure and keep auditing the remaining members
+            results[name] = e
+
+    # Each inner docx is read into memory and opened as a seekable stream, nothing is extracted to disk
+    if is_zip:
+        with ZipFile(container_file, 'r') as container:
+            for item in container.infolist():
+                if item.is_dir() or not _is_docx(item.filename):
+                    continue
+                read(item.filename, container.read(item))
+    else:
+        with tarfile.open(container_file, 'r:*') as container:
+            for member in container:
+                if not member.isfile() or not _is_docx(member.name):
+                    continue
+                read(member.name, container.extractfile(member).read())
+    return results
+
+
+def apply_container_protection(
+    container_path: str,
+    output_path: str,
+    password: str,
+    salt: str = None,
+    edit_option: Literal["forms", "none", "readOnly", "trackedChanges", "comments"] = "trackedChanges",
+    enforce_option: Literal[0, 1] = 1,
+    return_protection_params: bool = False,
+    if_needed: bool = False,
+    deterministic: bool = False,
+    return_exceptions: bool = False
+) -> Optional[Dict[str, Union[DocxProtectionParams, Exception]]]:
+    container_file, is_zip = _open_container(container_path)
+
+    # The container is streamed into the new one, so they can't be the same file
+    output_file = Path(output_path)
+    if output_file.exists() and output_file.samefile(container_file):
+        raise ValueError("The output path must differ from the container path")
+    _check_output_suffix(is_zip, output_file)
+
+    results = {}
+
+    def protect(name: str, docx_bytes: bytes) -> bytes:
+        try:
+            with ZipFile(BytesIO(docx_bytes), 'r') as docx:
+                protected_docx, protection_params = _protect_docx(
+                    docx, password, salt, edit_option, enforce_option, if_needed, deterministic)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            # Record the failure and copy the member unchanged
+            results[name] = e
+            return docx_bytes
+        results[name] = protection_params
+        # Keep the original bytes when the document is already protected as requested
+        return docx_bytes if protected_docx is None else protected_docx
+
+    # Write next to the output and move into place on success, so a failure never leaves a partial container
+    temp_file = output_file.with_name(f'.{output_file.name}.{uuid4().hex}.tmp')
+    try:
+        if is_zip:
+            # writestr ignores the archive level for ZipInfo members, so the level is passed per member
+            compresslevel = DETERMINISTIC_COMPRESSLEVEL if deterministic else None
+            with ZipFile(container_file, 'r') as container, ZipFile(temp_file, 'w', ZIP_DEFLATED) as output:
+                # Members keep their order, timestamps and compression type
+                for item in container.infolist():
+                    name = item.filename
+                    data = container.read(item)
+                    if not item.is_dir() and _is_docx(name):
+                        data = protect(name, data)
+                    output.writestr(item, data, compresslevel=compresslevel)
+        else:
+            with tarfile.open(container_file, 'r:*') as container, \
+                    _open_tar_output(temp_file, _tar_write_mode(output_file), deterministic) as output:
+                for member in container:
+                    name = member.name
+                    if not member.isfile():
+                        output.addfile(member)
+                        continue
+                    data = container.extractfile(member).read()
+                    if _is_docx(name):
+                        data = protect(name, data)
+                        member = copy.copy(member)
+                        member.size = len(data)
+                    output.addfile(member, BytesIO(data))
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+    # Failed members are only reported through the results
+    if return_protection_params or return_exceptions:
+        return results
@@ -1,14 +1,66 @@
+import sys
+from functools import lru_cache
 from zipfile import ZipFile, ZIP_DEFLATED
 from io import BytesIO
 from pathlib import Path
 from typing import Literal
 from lxml import etree
 from lxml.etree import QName
-from .encrypt import generate_docx_protection
-from typing import Optional
+from .encrypt import (
+    DEFAULT_SPIN_COUNT,
+    DocxEncrypt,
+    generate_docx_protection,
+    verify_docx_protection,
+    derive_docx_salt,
+)
+from .record import FrozenRecord
+from typing import Iterable, List, Optional, Tuple
 
 
-class DocxProtectionParams:
+# zlib level used for every member in deterministic mode
+DETERMINISTIC_COMPRESSLEVEL = 6
+
+
+class DocxProtectionParams(FrozenRecord):
+    __slots__ = (
+        'edit_option',
+        'enforce_option',
+        'crypt_provider_type',
+        'crypt_algorithm_class',
+        'crypt_algorithm_type',
+        'crypt_algorithm_sid',
+        'crypt_spin_count',
+        'hash_value',
+        'salt_value',
+    )
+
+    edit_option: str
+    """Specifies the type of editing allowed, such as 'readOnly' or 'trackedChanges' (w:edit)."""
+
+    enforce_option: str
+    """Enforce document protection settings (w:Enforcement)."""
+
+    crypt_provider_type: str
+    """Specifies the cryptographic provider type (w:cryptProviderType)."""
+
+    crypt_algorithm_class: str
+    """Represents the cryptographic algorithm class (w:cryptAlgorithmClass)."""
+
+    crypt_algorithm_type: str
+    """Represents the cryptographic algorithm type (w:cryptAlgorithmType)."""
+
+    crypt_algorithm_sid: int
+    """Represents the cryptographic hashing algorithm SID (w:cryptAlgorithmSid)."""
+
+    crypt_spin_count: int
+    """Iterations to run the hashing algorithm (w:cryptSpinCount)."""
+
+    hash_value: str
+    """Represents the password hash value (w:hashValue)."""
+
+    salt_value: str
+    """Represents the salt value used for the password verifier (w:saltValue)."""
+
     def __init__(
         self,
         edit_option: str = None,
@@ -24,32 +76,119 @@ class DocxProtectionParams:
         """
         Initializes the DocxProtectionParams class with the provided protection settings.
         """
-        self.edit_option = edit_option
-        """Specifies the type of editing allowed, such as 'readOnly' or 'trackedChanges' (w:edit)."""
+        self._init_fields(
+            edit_option,
+            enforce_option,
+            crypt_provider_type,
+            crypt_algorithm_class,
+            crypt_algorithm_type,
+            crypt_algorithm_sid,
+            crypt_spin_count,
+            hash_value,
+            salt_value
+        )
+
+
+def protection_params_to_tuples(
+    protection_params: Iterable[Optional[DocxProtectionParams]]
+) -> List[Optional[tuple]]:
+    """Converts protection params to plain tuples, keeping `None` for unprotected documents."""
+    return [params.to_tuple() if params is not None else None for params in protection_params]
+
 
-        self.enforce_option = enforce_option
-        """Enforce document protection settings (w:Enforcement)."""
+def protection_params_from_tuples(rows: Iterable[Optional[tuple]]) -> List[Optional[DocxProtectionParams]]:
+    """Rebuilds protection params from tuples created by `protection_params_to_tuples`."""
+    return [DocxProtectionParams(*row) if row is not None else None for row in rows]
 
-        self.crypt_provider_type = crypt_provider_type
-        """Specifies the cryptographic provider type (w:cryptProviderType)."""
 
-        self.crypt_algorithm_class = crypt_algorithm_class
-        """Represents the cryptographic algorithm class (w:cryptAlgorithmClass)."""
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Attribute values repeat across documents, share one string object per value
+    return sys.intern(value) if value is not None else None
 
-        self.crypt_algorithm_type = crypt_algorithm_type
-        """Represents the cryptographic algorithm type (w:cryptAlgorithmType)."""
 
-        self.crypt_algorithm_sid = crypt_algorithm_sid
-        """Represents the cryptographic hashing algorithm SID (w:cryptAlgorithmSid)."""
+@lru_cache(maxsize=256)
+def _to_int(value: str) -> int:
+    return int(value)
 
-        self.crypt_spin_count = crypt_spin_count
-        """Iterations to run the hashing algorithm (w:cryptSpinCount)."""
 
-        self.hash_value = hash_value
-        """Represents the password hash value (w:hashValue)."""
+def _read_docx_protection(docx: ZipFile) -> Optional[DocxProtectionParams]:
+    if 'word/settings.xml' not in docx.namelist():
+        return None
 
-        self.salt_value = salt_value
-        """Represents the salt value used for the password verifier (w:saltValue)."""
+    # Read settings.xml
+    settings_xml = docx.read('word/settings.xml')
+    tree = etree.fromstring(settings_xml)
+
+    # Extract namespaces from the document
+    namespaces = tree.nsmap
+
+    # Find the documentProtection element
+    document_protection = tree.find('.//w:documentProtection', namespaces)
+    if document_protection is not None:
+        # Create an instance of DocxProtectionParams with the attributes extracted from the document
+        protection_params = DocxProtectionParams(
+            edit_option=_intern(document_protection.get(f'{{{namespaces["w"]}}}edit')),
+            enforce_option=_intern(document_protection.get(f'{{{namespaces["w"]}}}enforcement')),
+            crypt_provider_type=_intern(document_protection.get(f'{{{namespaces["w"]}}}cryptProviderType')),
+            crypt_algorithm_class=_intern(document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmClass')),
+            crypt_algorithm_type=_intern(document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmType')),
+            crypt_algorithm_sid=_to_int(document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmSid', '14')),
+            crypt_spin_count=_to_int(document_protection.get(f'{{{namespaces["w"]}}}cryptSpinCount', '10000')),
+            hash_value=document_protection.get(f'{{{namespaces["w"]}}}hash'),
+            salt_value=document_protection.get(f'{{{namespaces["w"]}}}salt')
+        )
+        return protection_params
+    return None
+
+
+def _protection_matches(
+    protection_params: Optional[DocxProtectionParams],
+    password: str,
+    salt: Optional[str],
+    edit_option: str,
+    enforce_option: int
+) -> bool:
+    # Nothing to compare against
+    if protection_params is None:
+        return False
+
+    # Compare the requested settings with the existing ones
+    if protection_params.edit_option != f'{edit_option}' or protection_params.enforce_option != f'{enforce_option}':
+        return False
+
+    # A rewrite would write the default crypt settings, anything else (including a weak or huge spin count)
+    # needs rewriting and is rejected before any hashing
+    expected_params = DocxEncrypt(DEFAULT_SPIN_COUNT, None, None)
+    existing_crypt = (
+        protection_params.crypt_spin_count,
+        protection_params.crypt_algorithm_sid,
+        protection_params.crypt_algorithm_type,
+        protection_params.crypt_algorithm_class,
+        protection_params.crypt_provider_type,
+    )
+    expected_crypt = (
+        expected_params.spin_count,
+        expected_params.algo_sid,
+        expected_params.algo_type,
+        expected_params.algo_class,
+        expected_params.provider_type,
+    )
+    if existing_crypt != expected_crypt:
+        return False
+
+    if not protection_params.hash_value or not protection_params.salt_value:
+        return False
+
+    # A different explicit salt means the verifier would change
+    if salt and salt != protection_params.salt_value:
+        return False
+
+    return verify_docx_protection(
+        password,
+        protection_params.hash_value,
+        protection_params.salt_value,
+        protection_params.crypt_spin_count
+    )
 
 
 def get_docx_protection(doc_path: str) -> DocxProtectionParams:
@@ -60,33 +199,132 @@ def get_docx_protection(doc_path: str) -> DocxProtectionParams:
 
     # Unzip the file in memory
     with ZipFile(doc_file, 'r') as docx:
-        if 'word/settings.xml' not in docx.namelist():
-            return None
-
-        # Read settings.xml
-        settings_xml = docx.read('word/settings.xml')
-        tree = etree.fromstring(settings_xml)
-
-        # Extract namespaces from the document
-        namespaces = tree.nsmap
-
-        # Find the documentProtection element
-        document_protection = tree.find('.//w:documentProtection', namespaces)
-        if document_protection is not None:
-            # Create an instance of DocxProtectionParams with the attributes extracted from the document
-            protection_params = DocxProtectionParams(
-                edit_option=document_protection.get(f'{{{namespaces["w"]}}}edit'),
-                enforce_option=document_protection.get(f'{{{namespaces["w"]}}}enforcement'),
-                crypt_provider_type=document_protection.get(f'{{{namespaces["w"]}}}cryptProviderType'),
-                crypt_algorithm_class=document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmClass'),
-                crypt_algorithm_type=document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmType'),
-                crypt_algorithm_sid=int(document_protection.get(f'{{{namespaces["w"]}}}cryptAlgorithmSid', 14)),
-                crypt_spin_count=int(document_protection.get(f'{{{namespaces["w"]}}}cryptSpinCount', 10000)),
-                hash_value=document_protection.get(f'{{{namespaces["w"]}}}hash'),
-                salt_value=document_protection.get(f'{{{namespaces["w"]}}}salt')
-            )
-            return protection_params
-    return None
+        return _read_docx_protection(docx)
+
+
+def _derive_archive_salt(docx: ZipFile) -> str:
+    # Hash member names, sizes and CRCs from the central directory, no member is decompressed
+    fingerprint = ''.join(f'{item.filename}:{item.file_size}:{item.CRC};' for item in docx.infolist())
+
+    return derive_docx_salt(fingerprint.encode('utf-8'))
+
+
+def _protect_docx(
+    docx: ZipFile,
+    password: str,
+    salt: str = None,
+    edit_option: str = "trackedChanges",
+    enforce_option: int = 1,
+    if_needed: bool = False,
+    deterministic: bool = False
+) -> Tuple[Optional[bytes], Optional[DocxProtectionParams]]:
+    # Skip the rewrite when the document is already protected as requested
+    if if_needed:
+        existing_params = _read_docx_protection(docx)
+        if _protection_matches(existing_params, password, salt, edit_option, enforce_option):
+            return None, existing_params
+
+    # Deterministic output derives the salt from the archive contents
+    if deterministic and not salt:
+        salt = _derive_archive_salt(docx)
+
+    # Generate the encryption vars
+    crypto_params = generate_docx_protection(password, salt)
+
+    # Copy all files except the one we're going to modify
+    in_memory_zip = BytesIO()
+    # writestr ignores the archive level for ZipInfo members, so the level is passed per member
+    compresslevel = DETERMINISTIC_COMPRESSLEVEL if deterministic else None
+    with ZipFile(in_memory_zip, 'w', ZIP_DEFLATED) as temp_docx:
+        for item in docx.infolist():
+            if item.filename != 'word/settings.xml':
+                temp_docx.writestr(item, docx.read(item.filename), compresslevel=compresslevel)
+            else:
+                # Read and modify the settings.xml file
+                settings_xml = docx.read('word/settings.xml')
+                parser = etree.XMLParser(remove_blank_text=False)
+                root = etree.fromstring(settings_xml, parser=parser)
+
+                # Get the namespace map from the root element
+                namespace_map = root.nsmap
+
+                # Get the 'w' namespace URI
+                NS_W = namespace_map.get('w', 'http://schemas.openxmlformats.org/wordprocessingml/2006/main')
+
+                # Get the 'mc' namespace URI if it exists
+                NS_MC = namespace_map.get('mc', 'http://schemas.openxmlformats.org/markup-compatibility/2006')
+
+                # Ensure mc:Ignorable attribute is preserved and updated
+                if NS_MC:
+                    mc_ignorable_attr_name = f'{{{NS_MC}}}Ignorable'
+                    mc_ignorable = root.attrib.get(mc_ignorable_attr_name, '')
+                    # Ensure 'w14 w15 w16se' are in mc:Ignorable
+                    required_mc_values = {'w14', 'w15', 'w16se'}
+                    existing_mc_values = set(mc_ignorable.split())
+                    missing_mc_values = required_mc_values - existing_mc_values
+                    if missing_mc_values:
+                        new_mc_ignorable = mc_ignorable + ' ' + ' '.join(missing_mc_values)
+                        root.attrib[mc_ignorable_attr_name] = new_mc_ignorable.strip()
+
+                # Check if the <w:trackRevisions> element exists, if not, add it at the end of <w:settings>
+                track_changes = root.find('w:trackRevisions', namespaces=namespace_map)
+                if track_changes is None:
+                    track_changes_element = etree.Element(QName(NS_W, 'trackRevisions'))
+                    root.append(track_changes_element)
+
+                # Build the <w:documentProtection> element
+                document_protection_element = etree.Element(
+                    QName(NS_W, 'documentProtection'),
+                    attrib={
+                        QName(NS_W, 'edit'): f'{edit_option}',
+                        QName(NS_W, 'enforcement'): f'{enforce_option}',
+                        QName(NS_W, 'cryptProviderType'): f'{crypto_params.provider_type}',
+                        QName(NS_W, 'cryptAlgorithmClass'): f'{crypto_params.algo_class}',
+                        QName(NS_W, 'cryptAlgorithmType'): f'{crypto_params.algo_type}',
+                        QName(NS_W, 'cryptAlgorithmSid'): f'{crypto_params.algo_sid}',
+                        QName(NS_W, 'cryptSpinCount'): f'{crypto_params.spin_count}',
+                        QName(NS_W, 'hash'): f'{crypto_params.key_hash}',
+                        QName(NS_W, 'salt'): f'{crypto_params.salt_hash}'
+                    }
+                )
+                # Check if the <w:documentProtection> element exists, if not, insert it
+                document_protection = root.find('w:documentProtection', namespaces=namespace_map)
+                if document_protection is None:
+                    # Insert after w:trackRevisions if it exists, else at the beginning
+                    insert_index = 0
+                    for idx, child in enumerate(root):
+                        if child.tag == QName(NS_W, 'trackRevisions'):
+                            insert_index = idx + 1
+                            break
+                    root.insert(insert_index, document_protection_element)
+                else:
+                    # Replace the existing <w:documentProtection> element
+                    root.replace(document_protection, document_protection_element)
+
+                # Convert the modified XML tree back to a string
+                if deterministic:
+                    # Canonical form so equal trees always serialize to equal bytes
+                    modified_settings_xml = etree.tostring(root, method='c14n')
+                else:
+                    modified_settings_xml = etree.tostring(
+                        root, encoding='utf-8', xml_declaration=False, pretty_print=False)
+
+                # Write the modified settings.xml back into the archive, keeping the
+                # original timestamp and compression when output must be reproducible
+                temp_docx.writestr(
+                    item if deterministic else 'word/settings.xml', modified_settings_xml, compresslevel=compresslevel)
+
+    return in_memory_zip.getvalue(), DocxProtectionParams(
+        edit_option=edit_option,
+        enforce_option=str(enforce_option),
+        crypt_provider_type=crypto_params.provider_type,
+        crypt_algorithm_class=crypto_params.algo_class,
+        crypt_algorithm_type=crypto_params.algo_type,
+        crypt_algorithm_sid=crypto_params.algo_sid,
+        crypt_spin_count=crypto_params.spin_count,
+        hash_value=crypto_params.key_hash,
+        salt_value=crypto_params.salt_hash
+    )
 
 
 def apply_docx_protection(
@@ -95,106 +333,24 @@ def apply_docx_protection(
     salt: str = None,
     edit_option: Literal["forms", "none", "readOnly", "trackedChanges", "comments"] = "trackedChanges",
     enforce_option: Literal[0, 1] = 1,
-    return_protection_params: bool = False
+    return_protection_params: bool = False,
+    if_needed: bool = False,
+    deterministic: bool = False
 ) -> Optional[DocxProtectionParams]:
     # Ensure the file exists
     doc_file = Path(doc_path)
     if not doc_file.exists():
         raise FileNotFoundError(f"The specified file does not exist: {doc_path}")
 
-    # Generate the encryption vars
-    crypto_params = generate_docx_protection(password, salt)
-
     # Unzip the file in memory
-    in_memory_zip = BytesIO()
     with ZipFile(doc_file, 'r') as docx:
-        # Copy all files except the one we're going to modify
-        with ZipFile(in_memory_zip, 'w', ZIP_DEFLATED) as temp_docx:
-            for item in docx.infolist():
-                if item.filename != 'word/settings.xml':
-                    temp_docx.writestr(item, docx.read(item.filename))
-                else:
-                    # Read and modify the settings.xml file
-                    settings_xml = docx.read('word/settings.xml')
-                    parser = etree.XMLParser(remove_blank_text=False)
-                    root = etree.fromstring(settings_xml, parser=parser)
-
-                    # Get the namespace map from the root element
-                    namespace_map = root.nsmap
-
-                    # Get the 'w' namespace URI
-                    NS_W = namespace_map.get('w', 'http://schemas.openxmlformats.org/wordprocessingml/2006/main')
-
-                    # Get the 'mc' namespace URI if it exists
-                    NS_MC = namespace_map.get('mc', 'http://schemas.openxmlformats.org/markup-compatibility/2006')
-
-                    # Ensure mc:Ignorable attribute is preserved and updated
-                    if NS_MC:
-                        mc_ignorable_attr_name = f'{{{NS_MC}}}Ignorable'
-                        mc_ignorable = root.attrib.get(mc_ignorable_attr_name, '')
-                        # Ensure 'w14 w15 w16se' are in mc:Ignorable
-                        required_mc_values = {'w14', 'w15', 'w16se'}
-                        existing_mc_values = set(mc_ignorable.split())
-                        missing_mc_values = required_mc_values - existing_mc_values
-                        if missing_mc_values:
-                            new_mc_ignorable = mc_ignorable + ' ' + ' '.join(missing_mc_values)
-                            root.attrib[mc_ignorable_attr_name] = new_mc_ignorable.strip()
-
-                    # Check if the <w:trackRevisions> element exists, if not, add it at the end of <w:settings>
-                    track_changes = root.find('w:trackRevisions', namespaces=namespace_map)
-                    if track_changes is None:
-                        track_changes_element = etree.Element(QName(NS_W, 'trackRevisions'))
-                        root.append(track_changes_element)
-
-                    # Build the <w:documentProtection> element
-                    document_protection_element = etree.Element(
-                        QName(NS_W, 'documentProtection'),
-                        attrib={
-                            QName(NS_W, 'edit'): f'{edit_option}',
-                            QName(NS_W, 'enforcement'): f'{enforce_option}',
-                            QName(NS_W, 'cryptProviderType'): f'{crypto_params.provider_type}',
-                            QName(NS_W, 'cryptAlgorithmClass'): f'{crypto_params.algo_class}',
-                            QName(NS_W, 'cryptAlgorithmType'): f'{crypto_params.algo_type}',
-                            QName(NS_W, 'cryptAlgorithmSid'): f'{crypto_params.algo_sid}',
-                            QName(NS_W, 'cryptSpinCount'): f'{crypto_params.spin_count}',
-                            QName(NS_W, 'hash'): f'{crypto_params.key_hash}',
-                            QName(NS_W, 'salt'): f'{crypto_params.salt_hash}'
-                        }
-                    )
-                    # Check if the <w:documentProtection> element exists, if not, insert it
-                    document_protection = root.find('w:documentProtection', namespaces=namespace_map)
-                    if document_protection is None:
-                        # Insert after w:trackRevisions if it exists, else at the beginning
-                        insert_index = 0
-                        for idx, child in enumerate(root):
-                            if child.tag == QName(NS_W, 'trackRevisions'):
-                                insert_index = idx + 1
-                                break
-                        root.insert(insert_index, document_protection_element)
-                    else:
-                        # Replace the existing <w:documentProtection> element
-                        root.replace(document_protection, document_protection_element)
-
-                    # Convert the modified XML tree back to a string
-                    modified_settings_xml = etree.tostring(
-                        root, encoding='utf-8', xml_declaration=False, pretty_print=False)
-
-                    # Write the modified settings.xml back into the archive
-                    temp_docx.writestr('word/settings.xml', modified_settings_xml)
+        protected_docx, protection_params = _protect_docx(
+            docx, password, salt, edit_option, enforce_option, if_needed, deterministic)
 
     # Write the in-memory ZIP buffer back to the original file
-    with open(doc_file, 'wb') as f:
-        f.write(in_memory_zip.getvalue())
+    if protected_docx is not None:
+        with open(doc_file, 'wb') as f:
+            f.write(protected_docx)
 
     if return_protection_params:
-        return DocxProtectionParams(
-            edit_option=edit_option,
-            enforce_option=str(enforce_option),
-            crypt_provider_type=crypto_params.provider_type,
-            crypt_algorithm_class=crypto_params.algo_class,
-            crypt_algorithm_type=crypto_params.algo_type,
-            crypt_algorithm_sid=crypto_params.algo_sid,
-            crypt_spin_count=crypto_params.spin_count,
-            hash_value=crypto_params.key_hash,
-            salt_value=crypto_params.salt_hash
-        )
+        return protection_params
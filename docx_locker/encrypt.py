@@ -1,9 +1,13 @@
 import hashlib
+import hmac
 import os
 import base64
+from .record import FrozenRecord
 
 
-class DocxEncrypt:
+class DocxEncrypt(FrozenRecord):
+    __slots__ = ('spin_count', 'key_hash', 'salt_hash', 'algo_sid', 'algo_type', 'algo_class', 'provider_type')
+
     def __init__(
         self,
         spin_count: int,
@@ -14,14 +18,11 @@ class DocxEncrypt:
         algo_class: str = "hash",
         provider_type: str = "rsaAES"
     ):
-        self.spin_count = spin_count
-        self.key_hash = key_hash
-        self.salt_hash = salt_hash
-        self.algo_sid = algo_sid
-        self.algo_type = algo_type
-        self.algo_class = algo_class
-        self.provider_type = provider_type
+        self._init_fields(spin_count, key_hash, salt_hash, algo_sid, algo_type, algo_class, provider_type)
+
 
+# Spin count used when none is given
+DEFAULT_SPIN_COUNT = 100000
 
 # Constants used in the hash computation
 InitialCodeArray = [
@@ -104,7 +105,7 @@ def create_hash(password: str) -> str:
 def generate_docx_protection(password: str, provided_salt: str = None, spins: int = None) -> DocxEncrypt:
     # Use provided salt or generate a new one
     salt = base64.b64decode(provided_salt) if provided_salt else os.urandom(16)
-    spin_count = spins if spins else 100000
+    spin_count = spins if spins else DEFAULT_SPIN_COUNT
 
     password_hash = create_hash(password)
 
@@ -121,3 +122,21 @@ def generate_docx_protection(password: str, provided_salt: str = None, spins: in
     hash_b64 = base64.b64encode(hash_value).decode('ascii')
 
     return DocxEncrypt(spin_count, hash_b64, salt_b64)
+
+
+def derive_docx_salt(data: bytes) -> str:
+    # Derive a stable 16 byte salt from the given data
+    salt = hashlib.sha512(data).digest()[:16]
+
+    return base64.b64encode(salt).decode('ascii')
+
+
+def verify_docx_protection(password: str, key_hash: str, salt: str, spins: int = None) -> bool:
+    # Recompute the verifier with the stored salt and spin count
+    try:
+        crypto_params = generate_docx_protection(password, salt, spins)
+    except ValueError:
+        # Malformed base64 salt, the verifier can't match
+        return False
+
+    return hmac.compare_digest(crypto_params.key_hash.encode('utf-8'), key_hash.encode('utf-8'))
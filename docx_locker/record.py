@@ -0,0 +1,51 @@
+from typing import Any, Iterable, Tuple
+
+
+class FrozenRecord:
+    """
+    Base class for slotted, immutable parameter objects.
+
+    Fields are the entries of `__slots__`, in the same order as the subclass constructor arguments.
+    """
+    __slots__ = ()
+
+    def _init_fields(self, *values: Any):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        """Returns the field values as a tuple, in constructor argument order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_tuple(cls, values: Iterable[Any]):
+        """Builds an instance from a tuple created by `to_tuple`."""
+        return cls(*values)
+
+    def replace(self, **changes: Any):
+        """Returns a copy with the given fields replaced."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return type(self)(**values)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.to_tuple())
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self):
+        # Pickle as the class and a plain tuple, the compact serialized form
+        return type(self), self.to_tuple()
@@ -0,0 +1,68 @@
+import pytest
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from docx_locker import apply_docx_protection_batch, get_docx_protection_batch, get_docx_protection
+from docx_locker.encrypt import generate_docx_protection
+
+
+@pytest.fixture
+def doc_paths(tmp_path):
+    paths = []
+    for i in range(6):
+        source = "tests/test_files/protected.docx" if i % 2 else "tests/test_files/unprotected.docx"
+        doc_path = tmp_path / f"doc_{i}.docx"
+        shutil.copyfile(source, doc_path)
+        paths.append(str(doc_path))
+    return paths
+
+
+def test_get_docx_protection_batch_matches_sequential(doc_paths):
+    results = get_docx_protection_batch(doc_paths, max_workers=4)
+    assert list(results) == doc_paths, "Results should be keyed by path in input order"
+    for doc_path, protection_settings in results.items():
+        expected = get_docx_protection(doc_path)
+        if expected is None:
+            assert protection_settings is None, "Unprotected document should have no protection settings"
+        else:
+            assert protection_settings.hash_value == expected.hash_value, "Hash does not match sequential read"
+            assert protection_settings.salt_value == expected.salt_value, "Salt does not match sequential read"
+
+
+def test_apply_docx_protection_batch(doc_paths):
+    results = apply_docx_protection_batch(
+        doc_paths + doc_paths[:2], "password", edit_option="readOnly", return_protection_params=True, max_workers=4)
+    assert list(results) == doc_paths, "Duplicate paths should only be protected once"
+
+    for doc_path, protection_params in results.items():
+        protection_settings = get_docx_protection(doc_path)
+        assert protection_settings.edit_option == "readOnly", "Edit option should be readOnly"
+        assert protection_settings.hash_value == protection_params.hash_value, "Returned hash should match the file"
+
+
+@pytest.mark.parametrize("position", [0, 3, 6])
+def test_apply_docx_protection_batch_invalid_file(doc_paths, position):
+    doc_paths_with_invalid = doc_paths[:position] + ["tests/test_files/test.docx"] + doc_paths[position:]
+    with pytest.raises(FileNotFoundError):
+        apply_docx_protection_batch(doc_paths_with_invalid, "password", edit_option="readOnly", max_workers=1)
+
+    # Valid documents are still processed before the failure is raised
+    for doc_path in doc_paths:
+        assert get_docx_protection(doc_path).edit_option == "readOnly", "Valid documents should be protected"
+
+
+def test_apply_docx_protection_batch_return_exceptions(doc_paths):
+    results = apply_docx_protection_batch(
+        ["tests/test_files/test.docx"] + doc_paths, "password", edit_option="readOnly", max_workers=1,
+        return_exceptions=True)
+
+    assert isinstance(results["tests/test_files/test.docx"], FileNotFoundError), "Failure should be reported per path"
+    for doc_path in doc_paths:
+        assert results[doc_path].edit_option == "readOnly", "Valid documents should report their protection params"
+
+
+def test_generate_docx_protection_concurrent():
+    expected = generate_docx_protection('password', 'ouz9XiaimAE4pO6OOtk28g==', 1000).key_hash
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda _: generate_docx_protection('password', 'ouz9XiaimAE4pO6OOtk28g==', 1000).key_hash, range(32)))
+    assert all(result == expected for result in results), "Concurrent hashing should be consistent"
@@ -0,0 +1,197 @@
+import pytest
+import tarfile
+from io import BytesIO
+from zipfile import BadZipFile, ZipFile, ZIP_DEFLATED
+import docx_locker.container as container_module
+from docx_locker import apply_container_protection, get_container_protection
+
+
+@pytest.fixture
+def zip_container(tmp_path):
+    container_path = tmp_path / "bundle.zip"
+    with ZipFile(container_path, 'w') as container:
+        container.write("tests/test_files/protected.docx", "legal/protected.docx")
+        container.write("tests/test_files/unprotected.docx", "legal/unprotected.docx")
+        container.writestr("legal/readme.txt", "not a document")
+    return container_path
+
+
+def _build_tar_container(container_path, mode):
+    with tarfile.open(container_path, mode) as container:
+        container.add("tests/test_files/protected.docx", "legal/protected.docx")
+        container.add("tests/test_files/unprotected.docx", "legal/unprotected.docx")
+    return container_path
+
+
+@pytest.fixture
+def tar_container(tmp_path):
+    # A plain tar ending in a docx also looks like a zip to zipfile.is_zipfile
+    return _build_tar_container(tmp_path / "bundle.tar", 'w')
+
+
+@pytest.fixture
+def tar_gz_container(tmp_path):
+    return _build_tar_container(tmp_path / "bundle.tar.gz", 'w:gz')
+
+
+@pytest.mark.parametrize("container_fixture", ["zip_container", "tar_container", "tar_gz_container"])
+def test_get_container_protection(container_fixture, request):
+    results = get_container_protection(request.getfixturevalue(container_fixture))
+    assert set(results) == {"legal/protected.docx", "legal/unprotected.docx"}, "Only docx members should be audited"
+    assert results["legal/protected.docx"].salt_value == 'SKP/sgkziAF2G67DFMGFuQ==', "Salt does not match expected value"
+    assert results["legal/unprotected.docx"] is None, "Unprotected document should have no protection settings"
+
+
+@pytest.mark.parametrize(
+    "container_fixture, output_name",
+    [
+        ("zip_container", "protected.zip"),
+        ("tar_container", "protected.tar"),
+        ("tar_gz_container", "protected.tar.gz"),
+    ]
+)
+def test_apply_container_protection(container_fixture, output_name, request, tmp_path):
+    output_path = tmp_path / output_name
+    apply_container_protection(request.getfixturevalue(container_fixture), output_path, "password", edit_option="readOnly")
+
+    results = get_container_protection(output_path)
+    assert set(results) == {"legal/protected.docx", "legal/unprotected.docx"}, "All docx members should be kept"
+    for name, protection_settings in results.items():
+        assert protection_settings is not None, f"Protection settings should be set for {name}"
+        assert protection_settings.edit_option == "readOnly", "Edit option should be readOnly"
+
+
+def test_apply_container_protection_preserves_other_members(zip_container, tmp_path):
+    output_path = tmp_path / "protected.zip"
+    protection_params = apply_container_protection(zip_container, output_path, "password", return_protection_params=True)
+
+    with ZipFile(zip_container, 'r') as original, ZipFile(output_path, 'r') as protected:
+        assert original.namelist() == protected.namelist(), "Member order should be preserved"
+        assert protected.read("legal/readme.txt") == b"not a document", "Other members should be copied unchanged"
+
+    assert set(protection_params) == {"legal/protected.docx", "legal/unprotected.docx"}, "Protection params should be returned per document"
+
+
+def test_apply_container_protection_same_output(zip_container):
+    with pytest.raises(ValueError):
+        apply_container_protection(zip_container, zip_container, "password")
+
+
+def test_get_container_protection_invalid_container():
+    with pytest.raises(FileNotFoundError):
+        get_container_protection("tests/test_files/bundle.zip")
+
+
+def test_get_container_protection_not_an_archive(tmp_path):
+    not_an_archive = tmp_path / "bundle.zip"
+    not_an_archive.write_text("plain text")
+    with pytest.raises(ValueError):
+        get_container_protection(not_an_archive)
+
+
+@pytest.mark.parametrize(
+    "container_fixture, output_suffix",
+    [
+        ("zip_container", ".zip"),
+        ("tar_container", ".tar"),
+        ("tar_gz_container", ".tar.gz"),
+        ("tar_gz_container", ".tar.bz2"),
+        ("tar_gz_container", ".tar.xz"),
+    ]
+)
+def test_apply_container_protection_deterministic(container_fixture, output_suffix, request, tmp_path):
+    container_path = request.getfixturevalue(container_fixture)
+    outputs = []
+    for i in range(2):
+        output_path = tmp_path / f"protected_{i}{output_suffix}"
+        apply_container_protection(container_path, output_path, "password", deterministic=True)
+        outputs.append(output_path.read_bytes())
+
+    assert outputs[0] == outputs[1], "Deterministic output should be byte-identical for identical input"
+
+
+def test_apply_container_protection_deterministic_compresslevel(tmp_path, monkeypatch):
+    zip_container = tmp_path / "bundle.zip"
+    with ZipFile(zip_container, 'w', ZIP_DEFLATED) as container:
+        container.write("tests/test_files/unprotected.docx", "legal/unprotected.docx")
+        container.writestr("legal/readme.txt", "not a document " * 100)
+
+    outputs = []
+    for level in (1, 9):
+        monkeypatch.setattr(container_module, 'DETERMINISTIC_COMPRESSLEVEL', level)
+        output_path = tmp_path / f"protected_{level}.zip"
+        apply_container_protection(zip_container, output_path, "password", deterministic=True)
+        outputs.append(output_path.read_bytes())
+
+    assert outputs[0] != outputs[1], "Deterministic compression level should be applied to every member"
+
+
+@pytest.fixture
+def zip_container_with_bad_docx(tmp_path):
+    container_path = tmp_path / "bundle.zip"
+    with ZipFile(container_path, 'w') as container:
+        container.write("tests/test_files/unprotected.docx", "legal/unprotected.docx")
+        container.writestr("legal/bad.docx", "not a zip archive")
+    return container_path
+
+
+def test_apply_container_protection_failure_leaves_no_output(zip_container_with_bad_docx, tmp_path):
+    output_path = tmp_path / "out" / "protected.zip"
+    output_path.parent.mkdir()
+    with pytest.raises(BadZipFile):
+        apply_container_protection(zip_container_with_bad_docx, output_path, "password")
+
+    assert list(output_path.parent.iterdir()) == [], "No partial or temporary output should be left behind"
+
+
+def test_apply_container_protection_return_exceptions(zip_container_with_bad_docx, tmp_path):
+    output_path = tmp_path / "protected.zip"
+    results = apply_container_protection(zip_container_with_bad_docx, output_path, "password", return_exceptions=True)
+
+    assert isinstance(results["legal/bad.docx"], BadZipFile), "Failed member should be reported with its exception"
+    assert results["legal/unprotected.docx"].edit_option == "trackedChanges", "Valid member should be protected"
+    with ZipFile(output_path, 'r') as protected:
+        assert protected.read("legal/bad.docx") == b"not a zip archive", "Failed member should be copied unchanged"
+
+
+@pytest.mark.parametrize(
+    "container_fixture, output_name",
+    [
+        ("zip_container", "protected.tar.gz"),
+        ("zip_container", "protected.docx"),
+        ("tar_container", "protected.zip"),
+        ("tar_container", "protected.gz"),
+        ("tar_gz_container", "protected.zip"),
+    ]
+)
+def test_apply_container_protection_mismatched_suffix(container_fixture, output_name, request, tmp_path):
+    output_path = tmp_path / output_name
+    with pytest.raises(ValueError):
+        apply_container_protection(request.getfixturevalue(container_fixture), output_path, "password")
+    assert not output_path.exists(), "No output should be written for a mismatched suffix"
+
+
+def test_get_container_protection_bad_docx(zip_container_with_bad_docx):
+    with pytest.raises(BadZipFile):
+        get_container_protection(zip_container_with_bad_docx)
+
+
+def test_get_container_protection_return_exceptions(zip_container_with_bad_docx):
+    results = get_container_protection(zip_container_with_bad_docx, return_exceptions=True)
+
+    assert isinstance(results["legal/bad.docx"], BadZipFile), "Failed member should be reported with its exception"
+    assert results["legal/unprotected.docx"] is None, "Valid members should still be audited"
+
+
+def test_get_container_protection_return_exceptions_tar(tmp_path):
+    container_path = tmp_path / "bundle.tar"
+    with tarfile.open(container_path, 'w') as container:
+        container.add("tests/test_files/protected.docx", "legal/protected.docx")
+        bad_docx = tarfile.TarInfo("legal/bad.docx")
+        bad_docx.size = len(b"not a zip archive")
+        container.addfile(bad_docx, BytesIO(b"not a zip archive"))
+
+    results = get_container_protection(container_path, return_exceptions=True)
+
+    assert isinstance(results["legal/bad.docx"], BadZipFile), "Failed member should be reported with its exception"
+    assert results["legal/protected.docx"].salt_value == 'SKP/sgkziAF2G67DFMGFuQ==', "Valid members should still be audited"
@@ -1,9 +1,13 @@
 import pytest
+import pickle
 import shutil
 from tempfile import NamedTemporaryFile
-from docx_locker import apply_docx_protection, get_docx_protection
+from docx_locker import apply_docx_protection, get_docx_protection, protection_params_to_tuples, protection_params_from_tuples
 from zipfile import ZipFile
+from io import BytesIO
 from lxml import etree
+import docx_locker.docx_locker as docx_locker_module
+from docx_locker.encrypt import generate_docx_protection
 
 
 @pytest.mark.parametrize(
@@ -374,3 +378,144 @@ def test_apply_docx_protection_with_large_password():
         assert protection_settings is not None, "Protection settings should not be None after applying protection"
         assert len(protection_settings.hash_value) > 0, "Hash value should be set for large password"
         assert len(protection_settings.salt_value) > 0, "Salt value should be set for large password"
+
+
+def test_apply_docx_protection_if_needed_skips_rewrite(protected_doc_path):
+    with NamedTemporaryFile(suffix=".docx", delete=True) as temp_file:
+        shutil.copyfile(protected_doc_path, temp_file.name)
+        with open(temp_file.name, 'rb') as f:
+            original_bytes = f.read()
+
+        # The fixture is protected with trackedChanges and the password "password"
+        protection_params = apply_docx_protection(
+            temp_file.name, "password", if_needed=True, return_protection_params=True)
+
+        with open(temp_file.name, 'rb') as f:
+            assert f.read() == original_bytes, "File should not be rewritten when protection already matches"
+        assert protection_params.salt_value == 'SKP/sgkziAF2G67DFMGFuQ==', "Existing protection params should be returned"
+
+
+@pytest.mark.parametrize(
+    "password, edit_option",
+    [
+        ("other_password", "trackedChanges"),
+        ("password", "readOnly"),
+    ]
+)
+def test_apply_docx_protection_if_needed_rewrites_on_change(protected_doc_path, password, edit_option):
+    with NamedTemporaryFile(suffix=".docx", delete=True) as temp_file:
+        shutil.copyfile(protected_doc_path, temp_file.name)
+
+        apply_docx_protection(temp_file.name, password, edit_option=edit_option, if_needed=True)
+
+        protection_settings = get_docx_protection(temp_file.name)
+        assert protection_settings.edit_option == edit_option, "Edit option should match the requested value"
+        assert protection_settings.salt_value != 'SKP/sgkziAF2G67DFMGFuQ==', "Protection should be regenerated"
+
+
+def test_apply_docx_protection_deterministic(unprotected_doc_path):
+    outputs = []
+    for _ in range(2):
+        with NamedTemporaryFile(suffix=".docx", delete=True) as temp_file:
+            shutil.copyfile(unprotected_doc_path, temp_file.name)
+            apply_docx_protection(temp_file.name, "password", deterministic=True)
+            with open(temp_file.name, 'rb') as f:
+                outputs.append(f.read())
+
+    assert outputs[0] == outputs[1], "Deterministic output should be byte-identical for identical input"
+
+    # Member order and timestamps should be preserved
+    with ZipFile(unprotected_doc_path, 'r') as original, ZipFile(BytesIO(outputs[0]), 'r') as protected:
+        original_members = [(item.filename, item.date_time) for item in original.infolist()]
+        protected_members = [(item.filename, item.date_time) for item in protected.infolist()]
+        assert original_members == protected_members, "Member order and timestamps should be preserved"
+
+
+def test_docx_protection_params_immutable_and_hashable(known_word_protection):
+    case = get_docx_protection(known_word_protection['doc_path'])
+
+    with pytest.raises(AttributeError):
+        case.edit_option = "readOnly"
+    assert not hasattr(case, '__dict__'), "Protection params should not carry a per-instance __dict__"
+
+    same = get_docx_protection(known_word_protection['doc_path'])
+    assert case == same, "Params read from the same document should be equal"
+    assert len({case, same}) == 1, "Equal params should hash the same"
+
+    changed = case.replace(edit_option="readOnly")
+    assert changed.edit_option == "readOnly", "Replace should return a copy with the new value"
+    assert case.edit_option == known_word_protection['edit_option'], "Replace should not modify the original"
+
+
+def test_docx_protection_params_tuple_round_trip(known_word_protection):
+    params = [get_docx_protection(known_word_protection['doc_path']), None]
+
+    rows = protection_params_to_tuples(params)
+    assert rows[0][-1] == known_word_protection['salt'], "Tuple fields should follow constructor order"
+    assert rows[1] is None, "None should be kept for unprotected documents"
+    assert protection_params_from_tuples(rows) == params, "Round trip through tuples should be lossless"
+    assert pickle.loads(pickle.dumps(params[0])) == params[0], "Params should survive pickling"
+
+
+def test_apply_docx_protection_deterministic_compresslevel(unprotected_doc_path, monkeypatch):
+    outputs = []
+    for level in (1, 9):
+        monkeypatch.setattr(docx_locker_module, 'DETERMINISTIC_COMPRESSLEVEL', level)
+        with NamedTemporaryFile(suffix=".docx", delete=True) as temp_file:
+            shutil.copyfile(unprotected_doc_path, temp_file.name)
+            apply_docx_protection(temp_file.name, "password", deterministic=True)
+            with open(temp_file.name, 'rb') as f:
+                outputs.append(f.read())
+
+    assert outputs[0] != outputs[1], "Deterministic compression level should be applied to every member"
+
+
+def test_apply_docx_protection_deterministic_if_needed(unprotected_doc_path):
+    with NamedTemporaryFile(suffix=".docx", delete=True) as temp_file:
+        shutil.copyfile(unprotected_doc_path, temp_file.name)
+        apply_docx_protection(temp_file.name, "password", deterministic=True, if_needed=True)
+        with open(temp_file.name, 'rb') as f:
+            first_run = f.read()
+
+        # A rerun must not derive a new salt and rewrite the already protected file
+        apply_docx_protection(temp_file.name, "password", deterministic=True, if_needed=True)
+        with open(temp_file.name, 'rb') as f:
+            assert f.read() == first_run, "Rerun should skip the rewrite"
+
+
+def _write_protected_docx(path, spin_count, key_hash, salt):
+    settings_xml = f'''
+    <w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+        <w:documentProtection w:edit="trackedChanges" w:enforcement="1"
+            w:cryptProviderType="rsaAES" w:cryptAlgorithmClass="hash"
+            w:cryptAlgorithmType="typeAny" w:cryptAlgorithmSid="14"
+            w:cryptSpinCount="{spin_count}" w:hash="{key_hash}" w:salt="{salt}"/>
+    </w:settings>
+    '''
+    with ZipFile(path, 'w') as docx:
+        docx.writestr('word/settings.xml', settings_xml)
+        docx.writestr('word/document.xml', '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"></w:document>')
+
+
+def test_apply_docx_protection_if_needed_huge_spin_count(tmp_path):
+    doc_path = tmp_path / "huge.docx"
+    _write_protected_docx(doc_path, 2000000000, "existingHash==", "ouz9XiaimAE4pO6OOtk28g==")
+
+    # A spin count the rewrite wouldn't use must be rejected without hashing, not verified for minutes
+    apply_docx_protection(str(doc_path), "password", if_needed=True)
+
+    protection_settings = get_docx_protection(str(doc_path))
+    assert protection_settings.crypt_spin_count == 100000, "Document should be rewritten with the default spin count"
+
+
+def test_apply_docx_protection_if_needed_weak_spin_count(tmp_path):
+    doc_path = tmp_path / "weak.docx"
+    crypto_params = generate_docx_protection("password", "ouz9XiaimAE4pO6OOtk28g==", 1)
+    _write_protected_docx(doc_path, 1, crypto_params.key_hash, crypto_params.salt_hash)
+
+    # The password verifies, but the spin count differs from what a rewrite would write
+    apply_docx_protection(str(doc_path), "password", if_needed=True)
+
+    protection_settings = get_docx_protection(str(doc_path))
+    assert protection_settings.crypt_spin_count == 100000, "Document should be rewritten with the default spin count"
+    assert protection_settings.hash_value != crypto_params.key_hash, "Hash should be regenerated"
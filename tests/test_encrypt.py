@@ -1,5 +1,5 @@
 import pytest
-from docx_locker.encrypt import generate_docx_protection
+from docx_locker.encrypt import DocxEncrypt, generate_docx_protection, verify_docx_protection, derive_docx_salt
 
 
 @pytest.fixture
@@ -55,3 +55,32 @@ def test_generate_docx_protection_with_custom_spins(password, spins, expected_sp
 def test_generate_docx_protection_invalid_inputs(invalid_args):
     with pytest.raises(TypeError):
         generate_docx_protection(*invalid_args)
+
+
+def test_verify_docx_protection_with_known_values(known_good_encrypt_params):
+    assert verify_docx_protection(
+        known_good_encrypt_params['password'],
+        known_good_encrypt_params['expected_key_hash'],
+        known_good_encrypt_params['salt'],
+        known_good_encrypt_params['spin_count']
+    ), "Known password should verify against its hash"
+    assert not verify_docx_protection(
+        'wrong_password',
+        known_good_encrypt_params['expected_key_hash'],
+        known_good_encrypt_params['salt'],
+        known_good_encrypt_params['spin_count']
+    ), "Wrong password should not verify"
+
+
+def test_derive_docx_salt_is_stable():
+    first = derive_docx_salt(b'document bytes')
+    assert first == derive_docx_salt(b'document bytes'), "Derived salt should be stable for the same input"
+    assert first != derive_docx_salt(b'other bytes'), "Derived salt should differ for different input"
+    assert len(first) == 24, "Derived salt length is not 24 characters"
+
+
+def test_docx_encrypt_immutable(known_good_encrypt_params):
+    case = generate_docx_protection(known_good_encrypt_params['password'], known_good_encrypt_params['salt'])
+    with pytest.raises(AttributeError):
+        case.spin_count = 1
+    assert DocxEncrypt.from_tuple(case.to_tuple()) == case, "Round trip through tuples should be lossless"